@@ -1,8 +1,124 @@
+import atexit
 import logging
 import os
+import queue
+import threading
+import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 
-def setup_logging(console_level=logging.INFO, file_level=logging.DEBUG, log_to_file=True):
+# Політики переповнення черги асинхронного логування
+OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest', 'block')
+
+# Активний слухач черги (потік, що пише записи у консоль та файл)
+_queue_listener = None
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Обробник, що лише кладе запис в обмежену чергу; запис у консоль і файл виконує
+    окремий потік QueueListener. Коли черга заповнена, діє політика переповнення:
+    відкинути найстаріший запис, відкинути новий або чекати на вільне місце.
+    """
+
+    def __init__(self, log_queue, overflow='drop_oldest'):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Невідома політика переповнення: '{overflow}'")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Без копіювання запису та повного форматування: у потоці запиту лише
+        # підставляємо аргументи у повідомлення
+        if record.exc_info or record.stack_info:
+            return super().prepare(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        if self.overflow == 'block':
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self.overflow == 'drop_newest':
+                return
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                pass
+
+
+class DebugSamplingFilter(logging.Filter):
+    """
+    Проріджує часті повідомлення рівня DEBUG і нижче окремо для кожного місця виклику
+    (логер + рядок): пропускає кожне sample_every-те повідомлення і не більше
+    max_per_second повідомлень за секунду. Повідомлення вищих рівнів не змінюються.
+
+    Рішення для запису приймається один раз і зберігається в його атрибуті, тож один
+    фільтр можна додати до кількох обробників (консоль і файл) без подвійного підрахунку.
+    """
+
+    def __init__(self, sample_every=1, max_per_second=None, level=logging.DEBUG):
+        super().__init__()
+        self.sample_every = max(1, sample_every)
+        self.max_per_second = max_per_second
+        self.level = level
+        self.suppressed = 0
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._attribute = f'_debug_sampled_{id(self)}'
+
+    def filter(self, record):
+        if record.levelno > self.level:
+            return True
+        decision = getattr(record, self._attribute, None)
+        if decision is not None:
+            return decision
+
+        key = (record.name, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            # [кількість викликів, початок поточної секунди, пропущено в ній]
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = [0, now, 0]
+            counter[0] += 1
+            allowed = (counter[0] - 1) % self.sample_every == 0
+            if allowed and self.max_per_second is not None:
+                if now - counter[1] >= 1.0:
+                    counter[1] = now
+                    counter[2] = 0
+                allowed = counter[2] < self.max_per_second
+                counter[2] += allowed
+            if not allowed:
+                self.suppressed += 1
+        setattr(record, self._attribute, allowed)
+        return allowed
+
+
+def shutdown_logging():
+    """Зупиняє асинхронне логування, дописавши всі записи з черги"""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def setup_logging(console_level=logging.INFO, file_level=logging.DEBUG, log_to_file=True,
+                  async_logging=False, queue_size=10000, overflow='drop_oldest',
+                  debug_sample_every=1, debug_max_per_second=None):
     """
     Налаштовує логування для всього проекту з різними рівнями для консолі та файлу
     
@@ -10,6 +126,12 @@ def setup_logging(console_level=logging.INFO, file_level=logging.DEBUG, log_to_f
         console_level: Рівень логування для консолі (за замовчуванням INFO)
         file_level: Рівень логування для файлу (за замовчуванням DEBUG)
         log_to_file: Чи записувати логи у файл
+        async_logging: Писати логи в окремому потоці через обмежену чергу, щоб запис
+                       на диск не блокував потік, що обробляє запит
+        queue_size: Максимальна кількість записів у черзі
+        overflow: Політика переповнення черги: 'drop_oldest', 'drop_newest' або 'block'
+        debug_sample_every: Пропускати лише кожне N-те DEBUG-повідомлення з одного місця виклику
+        debug_max_per_second: Не більше стількох DEBUG-повідомлень за секунду з одного місця виклику
     """
     
     # Створюємо форматери
@@ -26,14 +148,16 @@ def setup_logging(console_level=logging.INFO, file_level=logging.DEBUG, log_to_f
     root_logger.setLevel(min(console_level, file_level))
     
     # Очищуємо існуючі handlers
+    shutdown_logging()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    handlers = []
     
     # Console handler з рівнем INFO
     console_handler = logging.StreamHandler()
     console_handler.setLevel(console_level)
     console_handler.setFormatter(simple_formatter)
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler з рівнем DEBUG (опціонально)
     if log_to_file:
@@ -46,7 +170,7 @@ def setup_logging(console_level=logging.INFO, file_level=logging.DEBUG, log_to_f
         file_handler = logging.FileHandler(log_filename)
         file_handler.setLevel(file_level)
         file_handler.setFormatter(detailed_formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
         
         print(f"✅ Файл логів буде створено: {log_filename}")
         print(f"📊 Консоль: {logging.getLevelName(console_level)}, Файл: {logging.getLevelName(file_level)}")
@@ -57,4 +181,24 @@ def setup_logging(console_level=logging.INFO, file_level=logging.DEBUG, log_to_f
         # test_logger.info("ℹ️ INFO: Це повідомлення з'явиться і в консолі, і у файлі")
         # test_logger.warning("⚠️ WARNING: Це повідомлення з'явиться і в консолі, і у файлі")
     
+    # Проріджування частих DEBUG-повідомлень до форматування та запису
+    sampling_filter = None
+    if debug_sample_every > 1 or debug_max_per_second is not None:
+        sampling_filter = DebugSamplingFilter(debug_sample_every, debug_max_per_second)
+    
+    if async_logging:
+        # Потік запиту лише кладе запис у чергу, а консоль і файл обслуговує слухач
+        global _queue_listener
+        queue_handler = BoundedQueueHandler(queue.Queue(queue_size), overflow)
+        if sampling_filter is not None:
+            queue_handler.addFilter(sampling_filter)
+        root_logger.addHandler(queue_handler)
+        _queue_listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        _queue_listener.start()
+    else:
+        for handler in handlers:
+            if sampling_filter is not None:
+                handler.addFilter(sampling_filter)
+            root_logger.addHandler(handler)
+    
     return root_logger
\ No newline at end of file